@@ -4,117 +4,99 @@ A true agent that uses LLM to decide between direct responses and tool calls.
 Refactored with modular component architecture for better maintainability.
 """
 
-import os
+import asyncio
+import itertools
+import re
 import uuid
-from typing import Annotated, Sequence, TypedDict
+from functools import cache
+from typing import TYPE_CHECKING, Annotated, Any, Dict, Optional, Sequence, TypedDict
 
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolCall, ToolMessage, SystemMessage
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 from langgraph.graph.ui import AnyUIMessage, push_ui_message, ui_message_reducer, UIMessage
 
 # Import modular components
+from agent.utils.cache import TTLCache
+from agent.utils.cities import is_known_city
+from agent.utils.config import Config, get_config
 from agent.utils.language import detect_language
+from agent.utils.llm import get_chat_model
 from agent.handlers.registry import get_component_handler
 
-class AgentState(TypedDict):
-    """Agent state with messages and UI components."""
-
-    messages: Annotated[Sequence[BaseMessage], add_messages]
-    ui: Annotated[Sequence[AnyUIMessage], ui_message_reducer]
+if TYPE_CHECKING:
+    # Only needed for annotations; language_models pulls in the full chat model stack
+    from langchain_core.language_models import LanguageModelInput
+    from langchain_core.runnables import Runnable
 
-async def call_model(state: AgentState) -> dict[str, list[BaseMessage]]:
-    """Main model calling function with component handler support and UI component handling."""
-    messages = state["messages"]
-    
-    # Detect language from the latest user message
-    user_language = 'en'  # Default to English
-    if messages:
-        latest_message = messages[-1]
-        if hasattr(latest_message, 'content') and latest_message.content:
-            # Handle both string and list content types
-            content = latest_message.content
-            if isinstance(content, list):
-                # If content is a list, extract text from the first text element
-                text_content = ""
-                for item in content:
-                    if isinstance(item, dict) and item.get('type') == 'text':
-                        text_content = item.get('text', '')
-                        break
-                    elif isinstance(item, str):
-                        text_content = item
-                        break
-                if text_content:
-                    user_language = detect_language(text_content)
-            elif isinstance(content, str):
-                user_language = detect_language(content)
-    
-    # Define available tools using component handlers
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": "get_weather_data",
-                "description": "Get current weather information for a specific city. This tool will display a weather UI component with detailed weather data.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "city": {
-                            "type": "string",
-                            "description": "The name of the city to get weather for"
-                        }
-                    },
-                    "required": ["city"]
-                }
+# Available tools, mapped to component handlers in call_model
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_weather_data",
+            "description": "Get current weather information for a specific city. This tool will display a weather UI component with detailed weather data.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "city": {
+                        "type": "string",
+                        "description": "The name of the city to get weather for"
+                    }
+                },
+                "required": ["city"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "get_todo_data",
-                "description": "Create a task planning list when users ask for help with planning, organizing, preparing, or need step-by-step guidance. Use this for requests about planning events, preparing for activities, organizing tasks, creating schedules, or breaking down complex goals. This tool will display a todo UI component with organized tasks.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "request": {
-                            "type": "string",
-                            "description": "The user's request that needs to be broken down into actionable tasks or steps"
-                        }
-                    },
-                    "required": ["request"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_todo_data",
+            "description": "Create a task planning list when users ask for help with planning, organizing, preparing, or need step-by-step guidance. Use this for requests about planning events, preparing for activities, organizing tasks, creating schedules, or breaking down complex goals. This tool will display a todo UI component with organized tasks.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "request": {
+                        "type": "string",
+                        "description": "The user's request that needs to be broken down into actionable tasks or steps"
+                    }
+                },
+                "required": ["request"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "get_video_editing_data",
-                "description": "Create a video editing task plan when users ask for help with video editing, video production, or multimedia content creation. Use this for requests about editing videos, creating video content, post-production work, or video enhancement. This tool will display a specialized video editing UI component with subtraction (removal) and addition (enhancement) tasks organized in a Git diff-style layout.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "request": {
-                            "type": "string",
-                            "description": "The user's video editing request that needs to be broken down into removal and addition tasks"
-                        }
-                    },
-                    "required": ["request"]
-                }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_video_editing_data",
+            "description": "Create a video editing task plan when users ask for help with video editing, video production, or multimedia content creation. Use this for requests about editing videos, creating video content, post-production work, or video enhancement. This tool will display a specialized video editing UI component with subtraction (removal) and addition (enhancement) tasks organized in a Git diff-style layout.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "request": {
+                        "type": "string",
+                        "description": "The user's video editing request that needs to be broken down into removal and addition tasks"
+                    }
+                },
+                "required": ["request"]
             }
         }
-    ]
-    
-    # Initialize LLM with tools
-    llm = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL_ID", "gpt-3.5-turbo"),
-        temperature=0.7,
-        api_key=os.getenv("OPENAI_API_KEY")
-    ).bind_tools(tools)
-    
-    # Add system message for tool usage guidance
-    system_message = SystemMessage(
-        content="""You are a helpful AI assistant with access to weather, task planning, and video editing tools. 
+    }
+]
+
+
+# Tool names mapped to (component type, argument holding the user's request)
+TOOL_ROUTES = {
+    "get_weather_data": ("weather", "city"),
+    "get_todo_data": ("todo", "request"),
+    "get_video_editing_data": ("video_editing", "request"),
+}
+
+
+# Static system prompt; kept byte-identical across calls so the provider can
+# reuse its cached prefix
+SYSTEM_MESSAGE = SystemMessage(
+    content="""You are a helpful AI assistant with access to weather, task planning, and video editing tools. 
         
 Use the available tools when users ask for:
 - Weather information (use get_weather_data): When users ask about weather, temperature, conditions in any city
@@ -150,47 +132,194 @@ Examples of when to use get_video_editing_data:
 
 You can call multiple tools in a single response if needed. For general conversation that doesn't require planning, weather, or video editing, respond directly.
 IMPORTANT: You must respond in exactly the same language as the user's request."""
+)
+
+
+# Message ids are a random per-process prefix plus a counter: unique across
+# restarts without drawing fresh randomness for every message
+_MESSAGE_ID_PREFIX = uuid.uuid4().hex
+_message_counter = itertools.count()
+
+
+def _next_message_id() -> str:
+    """Return a new unique message id."""
+    return f"{_MESSAGE_ID_PREFIX}-{next(_message_counter)}"
+
+
+# Marks AIMessages that only anchor UI components in the chat; the frontend needs
+# them in the state, but their text duplicates the preceding ToolMessage
+UI_MESSAGE_FLAG = "ui_message"
+
+
+# Questions like "What's the weather in Tokyo?" that need no model routing
+_WEATHER_QUESTION_RE = re.compile(
+    r"\s*(?i:(?:what(?:'s| is) the )?weather (?:in|for) )(?P<city>[A-Z][a-z]+(?:[ '-][A-Z][a-z]+){0,3})\s*[?.!]?\s*"
+)
+
+
+# Detected languages keyed by message id, so re-runs over the same message skip detection
+_language_cache = TTLCache(ttl=3600.0)
+
+
+def _get_tool_model() -> "Runnable[LanguageModelInput, BaseMessage]":
+    """Return the shared chat model with the component tools bound."""
+    return _bind_tool_model(get_config())
+
+
+@cache
+def _bind_tool_model(settings: Config) -> "Runnable[LanguageModelInput, BaseMessage]":
+    """Bind the component tools once per configuration.
+    
+    The settings only key the cache, so a reload_config() produces a new binding.
+    """
+    return get_chat_model(temperature=0.7).bind_tools(TOOLS)
+
+
+class AgentState(TypedDict):
+    """Agent state with messages and UI components."""
+
+    messages: Annotated[Sequence[BaseMessage], add_messages]
+    ui: Annotated[Sequence[AnyUIMessage], ui_message_reducer]
+
+def _latest_message_text(messages: Sequence[BaseMessage]) -> str:
+    """Return the text of the latest message.
+    
+    Args:
+        messages: Conversation messages
+        
+    Returns:
+        Text of the latest message, or an empty string if there is none
+    """
+    if not messages:
+        return ""
+    
+    # Plain string content is by far the common case; check its exact type first
+    content = messages[-1].content
+    if type(content) is str:
+        return content
+    if isinstance(content, list):
+        # If content is a list, extract text from the first text element
+        for item in content:
+            if isinstance(item, str):
+                return item
+            if isinstance(item, dict) and item.get('type') == 'text':
+                return str(item.get('text', ''))
+    return ""
+
+def _detect_message_language(messages: Sequence[BaseMessage]) -> str:
+    """Return the language of the latest message, cached by message id.
+    
+    Args:
+        messages: Conversation messages
+        
+    Returns:
+        Language code ('en', 'zh', 'ja'), defaulting to English
+    """
+    message_id = getattr(messages[-1], 'id', None) if messages else None
+    if message_id is not None:
+        cached_language = _language_cache.get(message_id)
+        if cached_language is not None:
+            return cached_language
+    
+    text_content = _latest_message_text(messages)
+    user_language = detect_language(text_content) if text_content else 'en'
+    
+    if message_id is not None:
+        _language_cache.set(message_id, user_language)
+    return user_language
+
+def _route_locally(messages: Sequence[BaseMessage]) -> Optional[AIMessage]:
+    """Route an unambiguous weather question straight to the weather tool.
+    
+    Args:
+        messages: Conversation messages
+        
+    Returns:
+        AIMessage calling get_weather_data, or None if the model should decide
+    """
+    if not messages or not isinstance(messages[-1], HumanMessage):
+        return None
+    
+    # Only known cities take the shortcut; "weather in Dinner" still goes to the model
+    match = _WEATHER_QUESTION_RE.fullmatch(_latest_message_text(messages))
+    if not match or not is_known_city(match.group("city")):
+        return None
+    
+    return AIMessage(
+        id=_next_message_id(),
+        content="",
+        tool_calls=[{
+            "name": "get_weather_data",
+            "args": {"city": match.group("city")},
+            # Tool call ids stay short; some providers reject ids over 40 characters
+            "id": f"call_{uuid.uuid4().hex[:24]}"
+        }]
     )
+
+async def _run_tool_call(tool_call: ToolCall, user_language: str) -> Dict[str, Any]:
+    """Execute a tool call with the matching component handler.
+    
+    Args:
+        tool_call: Tool call requested by the model
+        user_language: Language code for the response
+        
+    Returns:
+        Dictionary with 'result' (text) and 'ui_components' (list of UI data)
+    """
+    tool_name = tool_call["name"]
+    
+    tool_route = TOOL_ROUTES.get(tool_name)
+    if not tool_route:
+        return {"result": f"Unknown tool: {tool_name}", "ui_components": []}
+    component_type, request_arg = tool_route
+    
+    # Get the appropriate component handler
+    handler = get_component_handler(component_type)
+    if not handler:
+        return {"result": f"Handler not found for {component_type}", "ui_components": []}
+    
+    # Process request using the handler
+    return await handler.process_request(tool_call["args"][request_arg], user_language)
+
+async def call_model(state: AgentState) -> dict[str, list[BaseMessage]]:
+    """Main model calling function with component handler support and UI component handling."""
+    messages = state["messages"]
     
-    # Prepare messages for the model
-    model_messages = [system_message] + messages
+    # Detect language from the latest user message
+    user_language = _detect_message_language(messages)
     
     try:
-        # Call the model
-        response = await llm.ainvoke(model_messages)
+        # Unambiguous weather questions are routed without a model call
+        local_response = _route_locally(messages)
+        response: BaseMessage
+        if local_response is not None:
+            response = local_response
+        else:
+            # Call the shared LLM with tools bound once per configuration
+            # UI anchor messages repeat their ToolMessage, so the model never sees them
+            model_messages: list[BaseMessage] = [SYSTEM_MESSAGE]
+            model_messages.extend(
+                message for message in messages
+                if not message.response_metadata.get(UI_MESSAGE_FLAG)
+            )
+            response = await _get_tool_model().ainvoke(model_messages)
         
         # Check if the model wants to use tools
-        if response.tool_calls:
-            # Process each tool call using component handlers
-            tool_messages = []
+        if isinstance(response, AIMessage) and response.tool_calls:
+            # Run all tool calls concurrently; results keep the tool call order
+            tool_results = await asyncio.gather(
+                *(_run_tool_call(tool_call, user_language) for tool_call in response.tool_calls),
+                return_exceptions=True
+            )
+            tool_messages: list[BaseMessage] = []
             
-            for tool_call in response.tool_calls:
+            for tool_call, tool_result in zip(response.tool_calls, tool_results):
                 tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
                 tool_call_id = tool_call["id"]
                 
                 try:
-                    # Map tool names to component types and get handlers
-                    component_type_map = {
-                        "get_weather_data": "weather",
-                        "get_todo_data": "todo", 
-                        "get_video_editing_data": "video_editing"
-                    }
-                    
-                    component_type = component_type_map.get(tool_name)
-                    if component_type:
-                        # Get the appropriate component handler
-                        handler = get_component_handler(component_type)
-                        if handler:
-                            # Process request using the handler
-                            if tool_name == "get_weather_data":
-                                tool_result = await handler.process_request(tool_args["city"], user_language)
-                            else:
-                                tool_result = await handler.process_request(tool_args["request"], user_language)
-                        else:
-                            tool_result = {"result": f"Handler not found for {component_type}", "ui_components": []}
-                    else:
-                        tool_result = {"result": f"Unknown tool: {tool_name}", "ui_components": []}
+                    if isinstance(tool_result, BaseException):
+                        raise tool_result
                     
                     # Create tool message
                     tool_message = ToolMessage(
@@ -199,20 +328,23 @@ IMPORTANT: You must respond in exactly the same language as the user's request."
                     )
                     tool_messages.append(tool_message)
                     
-                    # Process UI components using push_ui_message
-                    for ui_component in tool_result.get("ui_components", []):
-                        # Create an AIMessage for this UI component
+                    # Process UI components using push_ui_message; all components of
+                    # a tool result attach to a single AIMessage
+                    ui_components = tool_result.get("ui_components")
+                    if ui_components:
                         ui_message = AIMessage(
-                            id=str(uuid.uuid4()),
-                            content=tool_result["result"]
+                            id=_next_message_id(),
+                            content=tool_result["result"],
+                            response_metadata={UI_MESSAGE_FLAG: True}
                         )
                         
                         # Emit UI elements associated with the message
-                        push_ui_message(
-                            ui_component["type"],
-                            ui_component["data"],
-                            message=ui_message
-                        )
+                        for ui_component in ui_components:
+                            push_ui_message(
+                                ui_component["type"],
+                                ui_component["data"],
+                                message=ui_message
+                            )
                         tool_messages.append(ui_message)
                         
                 except Exception as e:
@@ -233,7 +365,7 @@ IMPORTANT: You must respond in exactly the same language as the user's request."
     except Exception as e:
         # Fallback response on error
         error_response = AIMessage(
-            id=str(uuid.uuid4()),
+            id=_next_message_id(),
             content=f"I apologize, but I encountered an error while processing your request. Please try again. Error: {str(e)}"
         )
         return {"messages": [error_response]}
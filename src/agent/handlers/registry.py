@@ -28,14 +28,19 @@ class ComponentRegistry:
     def register_handler(self, component_type: str, handler_class: Type[BaseComponentHandler]) -> None:
         """Register a component handler.
         
+        The handler is instantiated immediately and the instance is shared by
+        all requests, so handlers must be cheap to construct and hold no
+        per-request state.
+        
         Args:
             component_type: Type identifier for the component
             handler_class: Handler class that implements BaseComponentHandler
         """
+        # Instantiate eagerly so the first request does not pay for construction;
+        # nothing is registered if construction fails
+        handler = handler_class()
         self._handlers[component_type] = handler_class
-        # Clear cached instance if exists
-        if component_type in self._instances:
-            del self._instances[component_type]
+        self._instances[component_type] = handler
     
     def get_handler(self, component_type: str) -> Optional[BaseComponentHandler]:
         """Get a component handler instance.
@@ -46,15 +51,7 @@ class ComponentRegistry:
         Returns:
             Handler instance or None if not found
         """
-        if component_type not in self._handlers:
-            return None
-        
-        # Use cached instance if available
-        if component_type not in self._instances:
-            handler_class = self._handlers[component_type]
-            self._instances[component_type] = handler_class()
-        
-        return self._instances[component_type]
+        return self._instances.get(component_type)
     
     def list_handlers(self) -> Dict[str, str]:
         """List all registered handlers.
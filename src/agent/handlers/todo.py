@@ -1,16 +1,41 @@
 """Todo component handler."""
 
-import os
-import re
-from typing import Dict, Any, TypedDict, List
+from functools import cache
+from typing import TYPE_CHECKING, Dict, Any, TypedDict, List
 
-from langchain_core.messages import HumanMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import HumanMessage, SystemMessage
 
 from .base import BaseComponentHandler
+from ..utils.cache import ResponseCache
+from ..utils.config import Config, get_config
 from ..utils.language import format_response
+from ..utils.llm import get_chat_model
 from ..utils.response import create_component_response, create_ui_component
 
+if TYPE_CHECKING:
+    from langchain_core.language_models import LanguageModelInput
+    from langchain_core.runnables import Runnable
+
+
+# Static planning instructions; the user's request is sent as a separate message
+PLANNING_SYSTEM_PROMPT = """You are a helpful task planning assistant. Based on the user's request, create a concise and actionable plan.
+
+Please provide:
+1. A clear, concise title for this plan (max 6 words)
+2. A list of 3-5 high-level, actionable tasks
+
+Constraints:
+- Keep tasks at a high level, not detailed sub-steps
+- Each task should be a meaningful milestone
+- Limit to 3-5 tasks maximum for better focus
+- Make each task actionable and clear
+
+Make sure each task represents a significant step towards the goal.
+IMPORTANT: You must respond in exactly the same language as the user's request."""
+
+# Built once; messages are not mutated once constructed
+_PLANNING_SYSTEM_MESSAGE = SystemMessage(content=PLANNING_SYSTEM_PROMPT)
+
 
 class TodoOutput(TypedDict):
     """Todo output with task list."""
@@ -19,6 +44,37 @@ class TodoOutput(TypedDict):
     tasks: List[str]
 
 
+# General plan shown when task planning fails
+_FALLBACK_TODO = TodoOutput(
+    title="General Plan",
+    tasks=[
+        "Analyze the request",
+        "Plan your approach",
+        "Take action",
+        "Review results"
+    ]
+)
+
+
+def _get_planner() -> "Runnable[LanguageModelInput, Any]":
+    """Return the shared chat model bound to the plan schema."""
+    return _bind_planner(get_config())
+
+
+@cache
+def _bind_planner(settings: Config) -> "Runnable[LanguageModelInput, Any]":
+    """Bind the plan schema once per configuration.
+    
+    The settings only key the cache, so a reload_config() produces a new binding.
+    """
+    # Function calling is supported by every OpenAI chat model, unlike json_schema
+    return get_chat_model(temperature=0.7).with_structured_output(TodoOutput, method="function_calling")
+
+
+# Complete handler responses keyed by normalized request and language
+_response_cache = ResponseCache(ttl=600.0)
+
+
 class TodoHandler(BaseComponentHandler):
     """Handler for todo/task planning requests."""
     
@@ -38,83 +94,46 @@ class TodoHandler(BaseComponentHandler):
             Dictionary with 'result' (text) and 'ui_components' (list of UI data)
         """
         try:
-            # Generate task plan using OpenAI
-            todo_data = await self._generate_task_plan(request)
-            
-            # Create UI component
-            ui_component = create_ui_component(self.component_type, todo_data)
-            
-            # Generate response text
-            result_text = format_response(
-                'todo_success', language,
-                title=todo_data['title'],
-                count=len(todo_data['tasks'])
+            # Repeated and concurrent identical requests share one response
+            return await _response_cache.get_or_build(
+                request, language, lambda: self._build_response(request, language)
             )
             
-            return create_component_response(result_text, [ui_component])
-            
         except Exception as e:
             # Fallback response if API call fails
             return self._create_fallback_todo_response(language)
     
+    async def _build_response(self, request: str, language: str) -> Dict[str, Any]:
+        """Generate a task plan and build the handler response."""
+        # Generate task plan using OpenAI
+        todo_data = await self._generate_task_plan(request)
+        
+        # Create UI component
+        ui_component = create_ui_component(self.component_type, todo_data)
+        
+        # Generate response text
+        result_text = format_response(
+            'todo_success', language,
+            title=todo_data['title'],
+            count=len(todo_data['tasks'])
+        )
+        
+        return create_component_response(result_text, [ui_component])
+    
     async def _generate_task_plan(self, request: str) -> TodoOutput:
         """Generate task plan using OpenAI API."""
-        # Initialize OpenAI client
-        llm = ChatOpenAI(
-            model=os.environ.get("OPENAI_MODEL_ID", "gpt-3.5-turbo"),
-            temperature=0.7,
-            api_key=os.getenv("OPENAI_API_KEY")
+        # Call OpenAI API with structured output; static instructions go first so
+        # the provider can reuse the cached prefix
+        plan = await _get_planner().ainvoke(
+            [_PLANNING_SYSTEM_MESSAGE, HumanMessage(content=request)]
         )
 
-        # Create prompt for task planning with optimized constraints
-        planning_prompt = f"""
-You are a helpful task planning assistant. Based on the user's request, create a concise and actionable plan.
-
-User request: {request}
-
-Please provide:
-1. A clear, concise title for this plan (max 6 words)
-2. A list of 3-5 high-level, actionable tasks in markdown bullet point format
-
-Constraints:
-- Keep tasks at a high level, not detailed sub-steps
-- Each task should be a meaningful milestone
-- Limit to 3-5 tasks maximum for better focus
-- Make each task actionable and clear
-
-Format your response as:
-Title: [Your title here]
-
-Tasks:
-- Task 1
-- Task 2
-- Task 3
-...
-
-Make sure each task represents a significant step towards the goal.
-IMPORTANT: You must respond in exactly the same language as the user's request.
-"""
-
-        # Call OpenAI API
-        response = await llm.ainvoke([HumanMessage(content=planning_prompt)])
-        ai_response = response.content
-
-        # Parse the response to extract title and tasks
         title = "Task Plan"
-        tasks = []
-
-        if isinstance(ai_response, str):
-            # Extract title
-            title_match = re.search(r"Title:\s*(.+)", ai_response)
-            if title_match:
-                title = title_match.group(1).strip()
+        tasks: List[str] = []
 
-            # Extract tasks (bullet points)
-            task_pattern = r"^\s*[-*]\s+(.+)$"
-            for line in ai_response.split("\n"):
-                match = re.match(task_pattern, line)
-                if match:
-                    tasks.append(match.group(1).strip())
+        if isinstance(plan, dict):
+            title = str(plan.get("title") or title).strip()
+            tasks = [str(task).strip() for task in plan.get("tasks") or [] if task]
 
         # Fallback if no tasks found
         if not tasks:
@@ -127,14 +146,10 @@ IMPORTANT: You must respond in exactly the same language as the user's request.
     
     def _create_fallback_todo_response(self, language: str) -> Dict[str, Any]:
         """Create fallback todo response when API call fails."""
+        # Copy so the shared constant is never handed out for mutation
         fallback_data = TodoOutput(
-            title="General Plan",
-            tasks=[
-                "Analyze the request",
-                "Plan your approach",
-                "Take action",
-                "Review results"
-            ]
+            title=_FALLBACK_TODO['title'],
+            tasks=list(_FALLBACK_TODO['tasks'])
         )
         
         ui_component = create_ui_component(self.component_type, fallback_data)
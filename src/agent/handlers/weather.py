@@ -1,16 +1,65 @@
 """Weather component handler."""
 
-import os
-from typing import Dict, Any, TypedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, Tuple, TypedDict, cast
 
-import httpx
 from langchain_core.messages import HumanMessage
-from langchain_openai import ChatOpenAI
 
 from .base import BaseComponentHandler
+from ..utils.cache import ResponseCache, SingleFlight, TTLCache, llm_cache
+from ..utils.cities import is_known_city
+from ..utils.config import get_config
+from ..utils.decoding import json_loads
+from ..utils.http import get_http_client
 from ..utils.language import format_response
+from ..utils.llm import get_chat_model
 from ..utils.response import create_component_response, create_ui_component
 
+if TYPE_CHECKING:
+    import httpx
+
+
+# City used when the user does not mention one
+DEFAULT_CITY = "San Francisco"
+
+# WeatherAPI current conditions endpoint
+WEATHER_API_URL = "http://api.weatherapi.com/v1/current.json"
+
+# Current conditions change slowly, so recent API responses are reused per city
+_weather_cache = TTLCache(ttl=60.0)
+
+# WeatherAPI error code for a location it cannot find
+_NO_LOCATION_ERROR_CODE = 1006
+
+# Recent unknown-location WeatherAPI responses keyed by normalized city; other
+# client errors (bad key, rate limit) may clear up and are never cached
+_rejected_cache = TTLCache(ttl=30.0)
+
+# In-flight WeatherAPI calls keyed by normalized city
+_weather_requests = SingleFlight()
+
+# Complete handler responses keyed by normalized request and language
+_response_cache = ResponseCache(ttl=60.0)
+
+
+def _is_unknown_location(response: "httpx.Response") -> bool:
+    """Return whether WeatherAPI rejected a request because it has no such location.
+    
+    Args:
+        response: WeatherAPI response
+        
+    Returns:
+        True for a 404 or a 400 carrying WeatherAPI error code 1006
+    """
+    if response.status_code == 404:
+        return True
+    if response.status_code != 400:
+        return False
+    try:
+        return bool(response.json()["error"]["code"] == _NO_LOCATION_ERROR_CODE)
+    except (ValueError, KeyError, TypeError):
+        return False
+
 
 class WeatherOutput(TypedDict):
     """Weather output with comprehensive weather information."""
@@ -25,6 +74,90 @@ class WeatherOutput(TypedDict):
     description: str
 
 
+# Card background gradients
+_GRAD_RAIN = "linear-gradient(135deg, #636e72 0%, #2d3436 100%)"
+_GRAD_CLOUD = "linear-gradient(135deg, #74b9ff 0%, #0984e3 100%)"
+_GRAD_SUN = "linear-gradient(135deg, #fdcb6e 0%, #e17055 100%)"
+_GRAD_SNOW = "linear-gradient(135deg, #ddd6fe 0%, #a78bfa 100%)"
+_GRAD_DEFAULT = "linear-gradient(135deg, #fd79a8 0%, #fdcb6e 100%)"
+
+# Weather styles as (icon, gradient, descriptions in multiple languages)
+_RAIN_STYLE = ("🌧️", _GRAD_RAIN, {
+    'en': 'Rainy weather today',
+    'zh': '今日有雨',
+    'ja': '今日は雨です'
+})
+_CLOUD_STYLE = ("⛅", _GRAD_CLOUD, {
+    'en': 'Partly cloudy skies',
+    'zh': '部分多云',
+    'ja': '部分的に曇り'
+})
+_CLEAR_STYLE = ("☀️", _GRAD_SUN, {
+    'en': 'Clear and sunny',
+    'zh': '晴朗天气',
+    'ja': '晴れて快晴'
+})
+_SNOW_STYLE = ("❄️", _GRAD_SNOW, {
+    'en': 'Snowy conditions',
+    'zh': '下雪天气',
+    'ja': '雪の天気'
+})
+_DEFAULT_WEATHER_STYLE = ("🌤️", _GRAD_DEFAULT, {
+    'en': 'Pleasant weather',
+    'zh': '宜人天气',
+    'ja': '快適な天気'
+})
+
+# Condition keywords mapped to styles, checked in priority order
+_WEATHER_STYLES = (
+    (("rain", "drizzle"), _RAIN_STYLE),
+    (("cloud",), _CLOUD_STYLE),
+    (("sun", "clear"), _CLEAR_STYLE),
+    (("snow",), _SNOW_STYLE),
+)
+
+
+@lru_cache(maxsize=256)
+def _weather_style(condition_text: str) -> Tuple[str, str, Dict[str, str]]:
+    """Return the style for a condition text.
+    
+    WeatherAPI reports a small, fixed set of condition texts, so each one is
+    resolved against the keyword table once and then served from the cache.
+    
+    Args:
+        condition_text: Condition text reported by the weather API
+        
+    Returns:
+        Tuple of (icon, gradient, descriptions by language)
+    """
+    # Pick the first style whose keywords appear in the condition
+    condition_lower = condition_text.lower()
+    return next(
+        (style for keywords, style in _WEATHER_STYLES
+         if any(keyword in condition_lower for keyword in keywords)),
+        _DEFAULT_WEATHER_STYLE
+    )
+
+# Sample weather shown when live data is unavailable; city and description are filled per request
+_FALLBACK_WEATHER: WeatherOutput = {
+    "city": DEFAULT_CITY,
+    "temperature": "72°F",
+    "condition": "Partly Cloudy",
+    "humidity": "65%",
+    "windSpeed": "8 mph",
+    "icon": "⛅",
+    "gradient": _GRAD_CLOUD,
+    "description": ""
+}
+
+# Fallback descriptions in multiple languages
+_FALLBACK_DESCRIPTIONS = {
+    'en': 'Weather data unavailable, showing sample data',
+    'zh': '天气数据不可用，显示示例数据',
+    'ja': '天気データが利用できません、サンプルデータを表示'
+}
+
+
 class WeatherHandler(BaseComponentHandler):
     """Handler for weather-related requests."""
     
@@ -44,69 +177,96 @@ class WeatherHandler(BaseComponentHandler):
             Dictionary with 'result' (text) and 'ui_components' (list of UI data)
         """
         try:
-            # Extract city from request
-            city = await self._extract_city_with_openai(request)
-            
-            # Fetch real weather data
-            weather_response = await self._fetch_weather_data(city)
-            weather_data = self._format_weather_data(weather_response, city, language)
-            
-            # Create UI component
-            ui_component = create_ui_component(self.component_type, weather_data)
-            
-            # Generate response text
-            result_text = format_response(
-                'weather', language,
-                city=weather_data['city'],
-                temperature=weather_data['temperature'],
-                condition=weather_data['condition'],
-                description=weather_data['description']
+            # Repeated and concurrent identical requests share one response
+            return await _response_cache.get_or_build(
+                request, language, lambda: self._build_response(request, language)
             )
             
-            return create_component_response(result_text, [ui_component])
-            
         except Exception as e:
             # Fallback to mock data if API calls fail
             return await self._create_fallback_weather_response(request, language)
     
+    async def _build_response(self, request: str, language: str) -> Dict[str, Any]:
+        """Fetch weather for the requested city and build the handler response."""
+        # Extract city from user input
+        city = await self._extract_city_with_openai(request)
+        
+        # Fetch real weather data
+        weather_response = await self._fetch_weather_data(city)
+        weather_data = self._format_weather_data(weather_response, city, language)
+        
+        # Create UI component
+        ui_component = create_ui_component(self.component_type, weather_data)
+        
+        # Generate response text
+        result_text = format_response(
+            'weather', language,
+            city=weather_data['city'],
+            temperature=weather_data['temperature'],
+            condition=weather_data['condition'],
+            description=weather_data['description']
+        )
+        
+        return create_component_response(result_text, [ui_component])
+    
     async def _extract_city_with_openai(self, user_input: str) -> str:
         """Extract city name from user input using OpenAI API."""
+        # The tool call usually passes a bare, known city name already; use it as is
+        city_candidate = user_input.strip()
+        if is_known_city(city_candidate):
+            return city_candidate
+        
         try:
-            llm = ChatOpenAI(
-                model=os.environ.get("OPENAI_MODEL_ID", "gpt-3.5-turbo"),
-                temperature=0,
-                api_key=os.getenv("OPENAI_API_KEY")
-            )
+            llm = get_chat_model(temperature=0)
             
             extraction_prompt = f"""
-Extract the city name from the following user input. If no city is mentioned, return "San Francisco" as default.
+Extract the city name from the following user input. If no city is mentioned, return "{DEFAULT_CITY}" as default.
 Only return the city name, nothing else.
 
 User input: {user_input}
 
 City:"""
             
-            response = await llm.ainvoke([HumanMessage(content=extraction_prompt)])
-            city = response.content.strip() if isinstance(response.content, str) else "San Francisco"
+            response = await llm_cache.ainvoke(llm, [HumanMessage(content=extraction_prompt)])
+            city = response.content.strip() if isinstance(response.content, str) else DEFAULT_CITY
             return city
         except Exception:
-            return "San Francisco"
+            return DEFAULT_CITY
+    
+    async def _fetch_weather_data(self, city: str) -> Dict[str, Any]:
+        """Fetch real weather data from WeatherAPI, serving recent lookups from cache."""
+        cache_key = city.strip().lower()
+        cached = _weather_cache.get(cache_key)
+        if cached is not None:
+            return cast(Dict[str, Any], cached)
+        
+        # Re-raise a recent rejection (e.g. unknown city) instead of asking again
+        rejected_response = _rejected_cache.get(cache_key)
+        if rejected_response is not None:
+            rejected_response.raise_for_status()
+        
+        # Concurrent lookups for the same city share one API call
+        return await _weather_requests.run(cache_key, lambda: self._request_weather_data(city, cache_key))
     
-    async def _fetch_weather_data(self, city: str) -> dict:
-        """Fetch real weather data from WeatherAPI."""
-        api_key = os.getenv("WEATHER_API_KEY")
+    async def _request_weather_data(self, city: str, cache_key: str) -> Dict[str, Any]:
+        """Request current weather from WeatherAPI and cache the response."""
+        api_key = get_config().weather_api_key
         if not api_key:
             raise ValueError("WEATHER_API_KEY not found in environment variables")
         
-        url = f"http://api.weatherapi.com/v1/current.json?key={api_key}&q={city}"
-        
-        # Create HTTP client
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
+        # Reuse the shared, pooled HTTP client; params are encoded by httpx so
+        # cities with spaces or non-ASCII names produce a valid query string
+        response = await get_http_client().get(
+            WEATHER_API_URL, params={"key": api_key, "q": city}
+        )
+        if _is_unknown_location(response):
+            _rejected_cache.set(cache_key, response)
+        response.raise_for_status()
+        weather_response = cast(Dict[str, Any], json_loads(response.content))
+        _weather_cache.set(cache_key, weather_response)
+        return weather_response
     
-    def _format_weather_data(self, weather_response: dict, city: str, language: str = 'en') -> WeatherOutput:
+    def _format_weather_data(self, weather_response: Dict[str, Any], city: str, language: str = 'en') -> WeatherOutput:
         """Format weather API response into WeatherOutput format."""
         current = weather_response.get("current", {})
         condition = current.get("condition", {})
@@ -123,57 +283,8 @@ City:"""
         wind_mph = current.get("wind_mph", 5)
         wind_speed = f"{wind_mph} mph"
         
-        # Weather condition descriptions in multiple languages
-        weather_descriptions = {
-            'rain': {
-                'en': 'Rainy weather today',
-                'zh': '今日有雨',
-                'ja': '今日は雨です'
-            },
-            'cloud': {
-                'en': 'Partly cloudy skies',
-                'zh': '部分多云',
-                'ja': '部分的に曇り'
-            },
-            'clear': {
-                'en': 'Clear and sunny',
-                'zh': '晴朗天气',
-                'ja': '晴れて快晴'
-            },
-            'snow': {
-                'en': 'Snowy conditions',
-                'zh': '下雪天气',
-                'ja': '雪の天気'
-            },
-            'default': {
-                'en': 'Pleasant weather',
-                'zh': '宜人天气',
-                'ja': '快適な天気'
-            }
-        }
-        
-        # Map weather conditions to icons and gradients
-        condition_lower = condition_text.lower()
-        if "rain" in condition_lower or "drizzle" in condition_lower:
-            icon = "🌧️"
-            gradient = "linear-gradient(135deg, #636e72 0%, #2d3436 100%)"
-            description = weather_descriptions['rain'].get(language, weather_descriptions['rain']['en'])
-        elif "cloud" in condition_lower:
-            icon = "⛅"
-            gradient = "linear-gradient(135deg, #74b9ff 0%, #0984e3 100%)"
-            description = weather_descriptions['cloud'].get(language, weather_descriptions['cloud']['en'])
-        elif "sun" in condition_lower or "clear" in condition_lower:
-            icon = "☀️"
-            gradient = "linear-gradient(135deg, #fdcb6e 0%, #e17055 100%)"
-            description = weather_descriptions['clear'].get(language, weather_descriptions['clear']['en'])
-        elif "snow" in condition_lower:
-            icon = "❄️"
-            gradient = "linear-gradient(135deg, #ddd6fe 0%, #a78bfa 100%)"
-            description = weather_descriptions['snow'].get(language, weather_descriptions['snow']['en'])
-        else:
-            icon = "🌤️"
-            gradient = "linear-gradient(135deg, #fd79a8 0%, #fdcb6e 100%)"
-            description = weather_descriptions['default'].get(language, weather_descriptions['default']['en'])
+        icon, gradient, descriptions = _weather_style(condition_text)
+        description = descriptions.get(language, descriptions['en'])
         
         return WeatherOutput(
             city=city,
@@ -191,25 +302,13 @@ City:"""
         try:
             city = await self._extract_city_with_openai(request)
         except Exception:
-            city = "San Francisco"
-        
-        # Fallback descriptions in multiple languages
-        fallback_descriptions = {
-            'en': 'Weather data unavailable, showing sample data',
-            'zh': '天气数据不可用，显示示例数据',
-            'ja': '天気データが利用できません、サンプルデータを表示'
-        }
+            city = DEFAULT_CITY
         
-        # Create fallback weather data
+        # Sample data with the requested city and a localized description
         fallback_weather: WeatherOutput = {
+            **_FALLBACK_WEATHER,
             "city": city,
-            "temperature": "72°F",
-            "condition": "Partly Cloudy",
-            "humidity": "65%",
-            "windSpeed": "8 mph",
-            "icon": "⛅",
-            "gradient": "linear-gradient(135deg, #74b9ff 0%, #0984e3 100%)",
-            "description": fallback_descriptions.get(language, fallback_descriptions['en'])
+            "description": _FALLBACK_DESCRIPTIONS.get(language, _FALLBACK_DESCRIPTIONS['en'])
         }
         
         ui_component = create_ui_component(self.component_type, fallback_weather)
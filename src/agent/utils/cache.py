@@ -0,0 +1,274 @@
+"""In-memory caching utilities."""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+T = TypeVar("T")
+
+
+# Trailing punctuation that does not change what a request asks for
+_TRAILING_PUNCTUATION = ".!?。！？"
+
+
+def normalize_request(text: str) -> str:
+    """Normalize a user request for use in an exact-match cache key.
+
+    Case, surrounding and repeated whitespace, and trailing punctuation are
+    ignored, so trivially different phrasings share a cache entry.
+
+    Args:
+        text: User request
+
+    Returns:
+        Normalized request text
+    """
+    return " ".join(text.casefold().split()).rstrip(_TRAILING_PUNCTUATION)
+
+
+class TTLCache:
+    """Size-bounded in-memory cache whose entries expire after a fixed TTL.
+
+    When the cache is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            ttl: Time-to-live for cached entries, in seconds
+            maxsize: Maximum number of entries to keep
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Tuple[Any, float]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a cached value, or None if missing or expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, including expired ones."""
+        return len(self._entries)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into a single execution.
+
+    While a call for a key is in flight, further callers with the same key
+    await its result instead of starting their own.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._inflight: Dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func`` for the key, or join the call already in flight.
+
+        Args:
+            key: Key identifying equivalent calls
+            func: Zero-argument coroutine function performing the call
+
+        Returns:
+            Result of the shared call
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        # Shield so a cancelled caller does not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: "asyncio.Future[Any]") -> None:
+        """Forget a finished call and mark its exception as retrieved."""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._inflight)
+
+
+class ResponseCache:
+    """Cache complete handler responses and coalesce concurrent misses.
+
+    Responses are keyed by normalized request and language. Concurrent
+    requests that miss the cache share one build; a failed build is not
+    cached, so each caller can fall back on its own.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl: Time-to-live for cached responses, in seconds
+            maxsize: Maximum number of cached responses
+        """
+        self._cache = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._requests = SingleFlight()
+
+    async def get_or_build(
+        self, request: str, language: str, build: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Return the cached response for a request, building it on a miss.
+
+        Args:
+            request: User request
+            language: Language code for the response
+            build: Zero-argument coroutine function building the response;
+                exceptions it raises propagate to every waiting caller
+
+        Returns:
+            Cached or newly built response
+        """
+        key = (normalize_request(request), language)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cast(T, cached)
+        return await self._requests.run(key, lambda: self._build_and_store(key, build))
+
+    async def _build_and_store(self, key: Hashable, build: Callable[[], Awaitable[T]]) -> T:
+        """Build a response and cache it once it succeeds."""
+        response = await build()
+        self._cache.set(key, response)
+        return response
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._cache.clear()
+
+
+class LLMCache:
+    """In-memory TTL cache for deterministic LLM responses.
+
+    Responses are keyed by a SHA256 hash of the model name, the messages and
+    the temperature. Only calls made with ``temperature == 0`` are cached,
+    since sampled responses are not expected to repeat.
+    """
+
+    def __init__(self, ttl: float = 3600.0, maxsize: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            ttl: Time-to-live for cached entries, in seconds
+            maxsize: Maximum number of cached responses
+        """
+        self._cache = TTLCache(ttl=ttl, maxsize=maxsize)
+
+    @staticmethod
+    def make_key(model: str, messages: List[Any], temperature: float) -> str:
+        """Build a cache key for an LLM call.
+
+        Args:
+            model: Model identifier
+            messages: Messages sent to the model
+            temperature: Sampling temperature
+
+        Returns:
+            Hex digest identifying the call
+        """
+        payload = {
+            "model": model,
+            "messages": [[message.type, message.content] for message in messages],
+            "temperature": temperature,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a cached response, or None if missing or expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached response or None
+        """
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a response in the cache.
+
+        Args:
+            key: Cache key
+            value: Response to store
+        """
+        self._cache.set(key, value)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._cache.clear()
+
+    async def ainvoke(self, llm: Any, messages: List[Any]) -> Any:
+        """Invoke the model, serving deterministic calls from the cache.
+
+        Args:
+            llm: Chat model to invoke
+            messages: Messages to send to the model
+
+        Returns:
+            Model response
+        """
+        if getattr(llm, "temperature", None) != 0:
+            return await llm.ainvoke(messages)
+
+        key = self.make_key(llm.model_name, messages, 0)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        response = await llm.ainvoke(messages)
+        self.set(key, response)
+        return response
+
+
+# Global cache instance shared by all handlers
+llm_cache = LLMCache()
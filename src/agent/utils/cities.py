@@ -0,0 +1,51 @@
+"""Known city names for resolving weather requests without the LLM."""
+
+from typing import FrozenSet
+
+# Casefolded names of major cities; anything else goes through LLM extraction
+KNOWN_CITIES: FrozenSet[str] = frozenset({
+    # North America
+    "new york", "new york city", "los angeles", "chicago", "houston", "phoenix",
+    "philadelphia", "san antonio", "san diego", "dallas", "austin", "san jose",
+    "san francisco", "seattle", "denver", "boston", "washington", "miami",
+    "atlanta", "las vegas", "portland", "detroit", "minneapolis", "nashville",
+    "new orleans", "honolulu", "anchorage", "salt lake city", "toronto",
+    "montreal", "vancouver", "calgary", "ottawa", "mexico city", "guadalajara",
+    "monterrey", "havana",
+    # South America
+    "sao paulo", "rio de janeiro", "buenos aires", "lima", "bogota", "santiago",
+    "caracas", "quito", "montevideo",
+    # Europe
+    "london", "paris", "berlin", "madrid", "barcelona", "rome", "milan",
+    "naples", "amsterdam", "brussels", "vienna", "zurich", "geneva", "munich",
+    "frankfurt", "hamburg", "prague", "budapest", "warsaw", "stockholm", "oslo",
+    "copenhagen", "helsinki", "dublin", "edinburgh", "manchester", "lisbon",
+    "porto", "athens", "istanbul", "moscow", "saint petersburg", "kyiv",
+    "bucharest", "venice", "florence", "nice", "lyon", "marseille",
+    # Asia
+    "tokyo", "osaka", "kyoto", "yokohama", "sapporo", "seoul", "busan",
+    "beijing", "shanghai", "guangzhou", "shenzhen", "hong kong", "taipei",
+    "chengdu", "hangzhou", "wuhan", "xi'an", "nanjing", "singapore",
+    "bangkok", "kuala lumpur", "jakarta", "manila", "hanoi", "ho chi minh city",
+    "mumbai", "delhi", "new delhi", "bangalore", "chennai", "kolkata",
+    "karachi", "lahore", "dhaka", "kathmandu", "dubai", "abu dhabi", "doha",
+    "riyadh", "tel aviv", "jerusalem", "tehran",
+    # Africa
+    "cairo", "lagos", "nairobi", "johannesburg", "cape town", "casablanca",
+    "marrakesh", "accra", "addis ababa", "tunis",
+    # Oceania
+    "sydney", "melbourne", "brisbane", "perth", "adelaide", "auckland",
+    "wellington",
+})
+
+
+def is_known_city(name: str) -> bool:
+    """Return whether a name is a known city.
+
+    Args:
+        name: Candidate city name
+
+    Returns:
+        True if the name, ignoring case and extra whitespace, is a known city
+    """
+    return " ".join(name.split()).casefold() in KNOWN_CITIES
@@ -0,0 +1,42 @@
+"""Environment configuration for the agent."""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Config:
+    """Settings read from the environment."""
+
+    openai_model_id: str
+    openai_api_key: Optional[str]
+    weather_api_key: Optional[str]
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Return the settings, reading the environment on first use.
+
+    Use reload_config() after changing environment variables at runtime
+    (e.g. in tests).
+
+    Returns:
+        Cached ``Config`` instance
+    """
+    return Config(
+        openai_model_id=os.environ.get("OPENAI_MODEL_ID", "gpt-3.5-turbo"),
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        weather_api_key=os.getenv("WEATHER_API_KEY")
+    )
+
+
+def reload_config() -> Config:
+    """Re-read all settings from the environment.
+
+    Returns:
+        Fresh ``Config`` instance
+    """
+    get_config.cache_clear()
+    return get_config()
@@ -0,0 +1,14 @@
+"""JSON decoding helpers."""
+
+import json
+from typing import Any, Callable, Union
+
+json_loads: Callable[[Union[str, bytes]], Any]
+
+try:
+    # orjson is optional; it decodes considerably faster than the stdlib parser
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+__all__ = ["json_loads"]
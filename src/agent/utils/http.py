@@ -0,0 +1,69 @@
+"""Shared HTTP client utilities."""
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+_http_client: Optional["httpx.AsyncClient"] = None
+_llm_http_client: Optional["httpx.AsyncClient"] = None
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the shared HTTP client, creating it on first use.
+
+    Reusing one client keeps connections alive across requests instead of
+    paying connection setup on every outbound call.
+
+    Returns:
+        Shared ``httpx.AsyncClient`` instance
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        # Imported lazily to keep httpx off the import path until first use
+        import httpx
+
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=20, max_connections=50, keepalive_expiry=30.0
+            ),
+        )
+    return _http_client
+
+
+def get_llm_http_client() -> "httpx.AsyncClient":
+    """Return the shared HTTP client for chat model calls, creating it on first use.
+
+    Model calls hold connections for the length of a completion, so they get
+    their own, larger pool; slow completions cannot starve quick API calls
+    made through get_http_client(). Timeout and pool limits match the OpenAI
+    SDK's own client defaults.
+
+    Returns:
+        Shared ``httpx.AsyncClient`` instance for chat models
+    """
+    global _llm_http_client
+    if _llm_http_client is None or _llm_http_client.is_closed:
+        # Imported lazily to keep httpx and openai off the import path until first use
+        import httpx
+        import openai
+
+        _llm_http_client = httpx.AsyncClient(
+            timeout=openai.DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_keepalive_connections=100, max_connections=1000, keepalive_expiry=30.0
+            ),
+        )
+    return _llm_http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP clients, e.g. on application shutdown."""
+    global _http_client, _llm_http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _llm_http_client is not None:
+        await _llm_http_client.aclose()
+        _llm_http_client = None
@@ -3,6 +3,10 @@
 import re
 from typing import Dict, Any
 
+# Kana also appear alongside CJK ideographs in Japanese, so it is checked first
+_JAPANESE_RE = re.compile(r'[\u3040-\u309f\u30a0-\u30ff]')
+_CHINESE_RE = re.compile(r'[\u4e00-\u9fff]')
+
 
 def detect_language(text: str) -> str:
     """Detect the language of the input text.
@@ -13,12 +17,16 @@ def detect_language(text: str) -> str:
     Returns:
         Language code: 'zh' for Chinese, 'ja' for Japanese, 'en' for English
     """
+    # Pure ASCII text (the common case) cannot contain CJK characters
+    if text.isascii():
+        return 'en'
+    
     # Japanese characters detection (Hiragana, Katakana) - check first
-    if re.search(r'[\u3040-\u309f\u30a0-\u30ff]', text):
+    if _JAPANESE_RE.search(text):
         return 'ja'
     
     # Chinese characters detection (CJK Unified Ideographs)
-    if re.search(r'[\u4e00-\u9fff]', text):
+    if _CHINESE_RE.search(text):
         return 'zh'
     
     # Default to English
@@ -54,6 +62,13 @@ RESPONSE_TEMPLATES = {
     }
 }
 
+# Templates flattened by (template key, language) so a lookup is a single dict access
+_TEMPLATES_BY_LANGUAGE = {
+    (template_key, language): template
+    for template_key, templates in RESPONSE_TEMPLATES.items()
+    for language, template in templates.items()
+}
+
 
 def get_response_template(template_key: str, language: str = 'en') -> str:
     """Get response template for given key and language.
@@ -65,8 +80,11 @@ def get_response_template(template_key: str, language: str = 'en') -> str:
     Returns:
         Template string
     """
-    return RESPONSE_TEMPLATES.get(template_key, {}).get(language, 
-        RESPONSE_TEMPLATES.get(template_key, {}).get('en', ''))
+    template = _TEMPLATES_BY_LANGUAGE.get((template_key, language))
+    if template is None:
+        # Unsupported language: fall back to English
+        template = _TEMPLATES_BY_LANGUAGE.get((template_key, 'en'), '')
+    return template
 
 
 def format_response(template_key: str, language: str, **kwargs) -> str:
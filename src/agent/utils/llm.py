@@ -0,0 +1,42 @@
+"""Shared chat model clients."""
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+from .config import Config, get_config
+from .http import get_llm_http_client
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+
+def get_chat_model(temperature: float) -> "ChatOpenAI":
+    """Return a shared chat model client for the given temperature.
+
+    Clients are created on first use and reused afterwards, so the underlying
+    HTTP connection pool stays warm across requests. All clients send their
+    requests through the shared chat model HTTP client, so every handler draws
+    on one connection pool. They are keyed on the configured model and API
+    key, so a reload_config() takes effect.
+
+    Args:
+        temperature: Sampling temperature
+
+    Returns:
+        Shared ``ChatOpenAI`` instance
+    """
+    return _create_chat_model(get_config(), temperature)
+
+
+@cache
+def _create_chat_model(settings: Config, temperature: float) -> "ChatOpenAI":
+    """Create a chat model client; cached per configuration and temperature."""
+    # Imported lazily to keep langchain_openai off the import path until first use
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=settings.openai_model_id,
+        temperature=temperature,
+        api_key=settings.openai_api_key,
+        http_async_client=get_llm_http_client()
+    )
@@ -14,13 +14,13 @@ async def test_extract_city_with_openai():
     """Test city extraction using OpenAI API through WeatherHandler."""
     handler = WeatherHandler()
     
-    with patch('agent.handlers.weather.ChatOpenAI') as mock_llm_class:
+    with patch('agent.handlers.weather.get_chat_model') as mock_get_llm:
         # Mock the LLM response
         mock_llm = AsyncMock()
         mock_response = AsyncMock()
         mock_response.content = "Beijing"
         mock_llm.ainvoke.return_value = mock_response
-        mock_llm_class.return_value = mock_llm
+        mock_get_llm.return_value = mock_llm
         
         # Test city extraction
         city = await handler._extract_city_with_openai("What's the weather in Beijing?")
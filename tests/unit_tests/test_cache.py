@@ -0,0 +1,133 @@
+"""Unit tests for the in-memory caches."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from agent.utils.cache import (
+    LLMCache,
+    ResponseCache,
+    SingleFlight,
+    TTLCache,
+    normalize_request,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def _make_llm(temperature: float) -> MagicMock:
+    llm = MagicMock()
+    llm.model_name = "gpt-test"
+    llm.temperature = temperature
+    llm.ainvoke = AsyncMock(return_value="response")
+    return llm
+
+
+async def test_llm_cache_reuses_deterministic_response() -> None:
+    cache = LLMCache()
+    llm = _make_llm(0)
+    messages = [HumanMessage(content="Weather in Paris?")]
+
+    assert await cache.ainvoke(llm, messages) == "response"
+    assert await cache.ainvoke(llm, messages) == "response"
+
+    llm.ainvoke.assert_called_once()
+
+
+async def test_llm_cache_skips_sampled_calls() -> None:
+    cache = LLMCache()
+    llm = _make_llm(0.7)
+    messages = [HumanMessage(content="Plan a party")]
+
+    await cache.ainvoke(llm, messages)
+    await cache.ainvoke(llm, messages)
+
+    assert llm.ainvoke.call_count == 2
+
+
+async def test_llm_cache_expires_entries() -> None:
+    cache = LLMCache(ttl=0)
+    llm = _make_llm(0)
+    messages = [HumanMessage(content="Weather in Paris?")]
+
+    await cache.ainvoke(llm, messages)
+    await cache.ainvoke(llm, messages)
+
+    assert llm.ainvoke.call_count == 2
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries() -> None:
+    cache = TTLCache(ttl=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+async def test_single_flight_coalesces_concurrent_calls() -> None:
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "sunny"
+
+    first = asyncio.ensure_future(flight.run("paris", fetch))
+    second = asyncio.ensure_future(flight.run("paris", fetch))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(first, second) == ["sunny", "sunny"]
+    assert calls == 1
+    assert len(flight) == 0
+
+
+async def test_single_flight_propagates_errors_to_all_callers() -> None:
+    flight = SingleFlight()
+
+    async def fail() -> None:
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flight.run("paris", fail), flight.run("paris", fail), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
+
+
+async def test_response_cache_keeps_successes_only() -> None:
+    cache = ResponseCache(ttl=60)
+    build = AsyncMock(side_effect=[ValueError("boom"), "plan", "unused"])
+
+    with pytest.raises(ValueError):
+        await cache.get_or_build("Plan my weekend", "en", build)
+    assert await cache.get_or_build("Plan my weekend", "en", build) == "plan"
+    assert await cache.get_or_build("plan my weekend!", "en", build) == "plan"
+
+    assert build.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Plan my weekend", "  plan   my WEEKEND? ", "Plan my weekend!"],
+)
+def test_normalize_request(text: str) -> None:
+    assert normalize_request(text) == "plan my weekend"
@@ -1,9 +1,47 @@
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
 from langgraph.pregel import Pregel
 
 from agent.graph import graph
+from agent.utils.config import get_config, reload_config
+from agent.utils.http import get_llm_http_client
+from agent.utils.llm import _create_chat_model, get_chat_model
 
 
 def test_placeholder() -> None:
     # TODO: You can add actual unit tests
     # for your graph and other logic here.
     assert isinstance(graph, Pregel)
+
+
+def test_reload_config_reads_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_MODEL_ID", "gpt-test")
+    monkeypatch.setenv("WEATHER_API_KEY", "weather-key")
+
+    settings = reload_config()
+
+    assert settings.openai_model_id == "gpt-test"
+    assert settings.weather_api_key == "weather-key"
+    assert get_config() is settings
+
+    monkeypatch.undo()
+    reload_config()
+
+
+@pytest.fixture
+def fresh_chat_models() -> Iterator[None]:
+    """Keep patched chat models out of the shared client cache."""
+    _create_chat_model.cache_clear()
+    yield
+    _create_chat_model.cache_clear()
+
+
+@pytest.mark.usefixtures("fresh_chat_models")
+def test_chat_models_share_the_http_client() -> None:
+    with patch('langchain_openai.ChatOpenAI') as mock_chat_openai:
+        get_chat_model(temperature=0.3)
+
+    assert mock_chat_openai.call_args.kwargs["http_async_client"] is get_llm_http_client()
+    assert "timeout" not in mock_chat_openai.call_args.kwargs
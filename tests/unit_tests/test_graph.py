@@ -0,0 +1,71 @@
+"""Unit tests for graph helpers."""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from agent.graph import UI_MESSAGE_FLAG, _route_locally, call_model
+
+
+@pytest.mark.parametrize(
+    ("text", "city"),
+    [
+        ("What's the weather in Tokyo?", "Tokyo"),
+        ("weather for San Francisco", "San Francisco"),
+    ],
+)
+def test_route_locally_calls_weather_tool(text: str, city: str) -> None:
+    response = _route_locally([HumanMessage(content=text)])
+
+    assert response is not None
+    assert response.tool_calls[0]["name"] == "get_weather_data"
+    assert response.tool_calls[0]["args"] == {"city": city}
+
+
+@pytest.mark.parametrize(
+    "messages",
+    [
+        [HumanMessage(content="What's the weather in Tokyo and plan my day?")],
+        [HumanMessage(content="what is the weather in paris")],
+        [HumanMessage(content="What's the weather in April?")],
+        [HumanMessage(content="weather for Monday")],
+        [HumanMessage(content="weather in Celsius")],
+        [HumanMessage(content="weather for Tomorrow")],
+        [HumanMessage(content="weather in My Area")],
+        [HumanMessage(content="weather in Dinner")],
+        [AIMessage(content="What's the weather in Tokyo?")],
+        [],
+    ],
+)
+def test_route_locally_defers_to_model(messages: list) -> None:
+    assert _route_locally(messages) is None
+
+
+def test_route_locally_keeps_tool_call_ids_short() -> None:
+    for _ in range(1000):
+        response = _route_locally([HumanMessage(content="What's the weather in Tokyo?")])
+
+        assert response is not None
+        assert len(response.tool_calls[0]["id"]) <= 40
+
+
+@pytest.mark.anyio
+async def test_call_model_hides_ui_messages_from_model() -> None:
+    ui_message = AIMessage(content="Sunny in Tokyo", response_metadata={UI_MESSAGE_FLAG: True})
+    messages = [
+        HumanMessage(content="How is Tokyo today?"),
+        AIMessage(content="", tool_calls=[{"name": "get_weather_data", "args": {"city": "Tokyo"}, "id": "call_1"}]),
+        ToolMessage(content="Sunny in Tokyo", tool_call_id="call_1"),
+        ui_message,
+        HumanMessage(content="Thanks!"),
+    ]
+    model = MagicMock()
+    model.ainvoke = AsyncMock(return_value=AIMessage(content="You're welcome!"))
+
+    with patch('agent.graph._get_tool_model', return_value=model):
+        result = await call_model({"messages": messages, "ui": []})
+
+    sent_messages = model.ainvoke.call_args[0][0]
+    assert ui_message not in sent_messages
+    assert len(sent_messages) == len(messages)  # system message replaces the UI message
+    assert result["messages"][0].content == "You're welcome!"
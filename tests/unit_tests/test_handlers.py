@@ -0,0 +1,78 @@
+"""Unit tests shared by the planning component handlers."""
+import asyncio
+from typing import Any, Dict
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agent.handlers.base import BaseComponentHandler
+from agent.handlers.todo import TodoHandler, TodoOutput
+from agent.handlers.video_editing import (
+    VideoEditingHandler,
+    VideoEditingOutput,
+    VideoEditingTask,
+)
+
+pytestmark = pytest.mark.anyio
+
+_TODO_PLAN = TodoOutput(title="Office Move", tasks=["Pack", "Move", "Unpack"])
+_VIDEO_EDITING_PLAN = VideoEditingOutput(
+    title="Travel Vlog",
+    subtractionTasks=[
+        VideoEditingTask(id="sub_1", title="Cut shaky clips", description="Remove unstable footage", completed=False)
+    ],
+    additionTasks=[
+        VideoEditingTask(id="add_1", title="Add music", description="Add an upbeat track", completed=False)
+    ]
+)
+
+HANDLERS = pytest.mark.parametrize(
+    ("handler_class", "plan_method", "plan"),
+    [
+        (TodoHandler, "_generate_task_plan", _TODO_PLAN),
+        (VideoEditingHandler, "_generate_video_editing_plan", _VIDEO_EDITING_PLAN),
+    ],
+)
+
+
+@HANDLERS
+async def test_process_request_caches_successful_responses(
+    handler_class: type, plan_method: str, plan: Dict[str, Any]
+) -> None:
+    handler: BaseComponentHandler = handler_class()
+
+    with patch.object(handler, plan_method, AsyncMock(return_value=plan)) as mock_plan:
+        first = await handler.process_request("Plan my cached request", "en")
+        second = await handler.process_request("  plan my CACHED request ", "en")
+
+    assert first is second
+    mock_plan.assert_called_once()
+
+
+@HANDLERS
+async def test_process_request_does_not_cache_fallbacks(
+    handler_class: type, plan_method: str, plan: Dict[str, Any]
+) -> None:
+    handler: BaseComponentHandler = handler_class()
+
+    with patch.object(handler, plan_method, AsyncMock(side_effect=Exception("API Error"))) as mock_plan:
+        await handler.process_request("Plan a failing request", "en")
+        await handler.process_request("Plan a failing request", "en")
+
+    assert mock_plan.call_count == 2
+
+
+@HANDLERS
+async def test_process_request_coalesces_concurrent_requests(
+    handler_class: type, plan_method: str, plan: Dict[str, Any]
+) -> None:
+    handler: BaseComponentHandler = handler_class()
+
+    with patch.object(handler, plan_method, AsyncMock(return_value=plan)) as mock_plan:
+        first, second = await asyncio.gather(
+            handler.process_request("Plan my concurrent request", "en"),
+            handler.process_request("plan my concurrent request!", "en"),
+        )
+
+    assert first is second
+    mock_plan.assert_called_once()
@@ -0,0 +1,35 @@
+"""Unit tests for language detection."""
+import pytest
+
+from agent.utils.language import detect_language, get_response_template
+
+
+@pytest.mark.parametrize(
+    ("text", "language"),
+    [
+        ("What's the weather in London?", "en"),
+        ("", "en"),
+        ("Café in Paris", "en"),
+        ("北京天气怎么样", "zh"),
+        ("東京の天気はどうですか", "ja"),
+        ("カレンダー", "ja"),
+        ("Plan a trip to 北京", "zh"),
+    ],
+)
+def test_detect_language(text: str, language: str) -> None:
+    assert detect_language(text) == language
+
+
+@pytest.mark.parametrize(
+    ("language", "expected"),
+    [
+        ("zh", "我已经创建了一个通用的视频编辑计划，包含移除和添加任务来帮助您的视频编辑项目。"),
+        ("fr", "I've created a general video editing plan with removal and addition tasks to help you with your video editing project."),
+    ],
+)
+def test_get_response_template_falls_back_to_english(language: str, expected: str) -> None:
+    assert get_response_template('video_editing_fallback', language) == expected
+
+
+def test_get_response_template_unknown_key() -> None:
+    assert get_response_template('missing', 'en') == ''
@@ -0,0 +1,55 @@
+"""Unit tests for the todo handler."""
+from typing import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agent.handlers.todo import TodoHandler, TodoOutput, _bind_planner
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def fresh_planner() -> Iterator[None]:
+    """Keep planners bound to patched models out of the shared binding cache."""
+    _bind_planner.cache_clear()
+    yield
+    _bind_planner.cache_clear()
+
+
+def _mock_planner(plan: object) -> MagicMock:
+    structured_llm = MagicMock()
+    structured_llm.ainvoke = AsyncMock(return_value=plan)
+    llm = MagicMock()
+    llm.with_structured_output.return_value = structured_llm
+    return llm
+
+
+async def test_generate_task_plan_uses_structured_output() -> None:
+    handler = TodoHandler()
+
+    with patch('agent.handlers.todo.get_chat_model') as mock_get_llm:
+        mock_llm = _mock_planner({
+            "title": "Birthday Party",
+            "tasks": ["Book a venue", "Send invitations", "Order the cake"],
+        })
+        mock_get_llm.return_value = mock_llm
+
+        result = await handler._generate_task_plan("Help me plan a birthday party")
+
+    assert result["title"] == "Birthday Party"
+    assert result["tasks"] == ["Book a venue", "Send invitations", "Order the cake"]
+    assert mock_llm.with_structured_output.call_args[0][0] is TodoOutput
+    mock_get_llm.assert_called_once_with(temperature=0.7)
+
+
+async def test_generate_task_plan_falls_back_without_tasks() -> None:
+    handler = TodoHandler()
+
+    with patch('agent.handlers.todo.get_chat_model') as mock_get_llm:
+        mock_get_llm.return_value = _mock_planner(None)
+
+        result = await handler._generate_task_plan("Help me plan a birthday party")
+
+    assert result["title"] == "Task Plan"
+    assert len(result["tasks"]) == 4
@@ -0,0 +1,89 @@
+"""Unit tests for the video editing handler."""
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from agent.handlers.video_editing import VideoEditingHandler
+
+pytestmark = pytest.mark.anyio
+
+
+def _mock_llm(content: str) -> MagicMock:
+    json_llm = MagicMock()
+    json_llm.ainvoke = AsyncMock(return_value=AIMessage(content=content))
+    llm = MagicMock()
+    llm.bind.return_value = json_llm
+    return llm
+
+
+async def test_generate_plan_uses_json_mode() -> None:
+    handler = VideoEditingHandler()
+    content = json.dumps({
+        "title": "Wedding Film",
+        "subtractionTasks": [{"title": "Cut dead air", "details": "Trim pauses", "tags": ["timing"]}],
+        "additionTasks": ["Color grade"],
+    })
+
+    with patch('agent.handlers.video_editing.get_chat_model') as mock_get_llm:
+        mock_llm = _mock_llm(content)
+        mock_get_llm.return_value = mock_llm
+
+        result = await handler._generate_video_editing_plan("Edit my wedding video")
+
+    mock_llm.bind.assert_called_once_with(response_format={"type": "json_object"})
+    assert result["title"] == "Wedding Film"
+    assert result["subtractionTasks"][0]["title"] == "Cut dead air"
+    assert result["subtractionTasks"][0]["tags"] == ["timing"]
+    assert result["additionTasks"][0]["description"] == "Add or enhance: color grade"
+
+
+async def test_generate_plan_wraps_a_single_string_tag() -> None:
+    handler = VideoEditingHandler()
+    content = json.dumps({
+        "title": "Wedding Film",
+        "subtractionTasks": [{"title": "Cut dead air", "details": "Trim pauses", "tags": "timing"}],
+        "additionTasks": [],
+    })
+
+    with patch('agent.handlers.video_editing.get_chat_model') as mock_get_llm:
+        mock_get_llm.return_value = _mock_llm(content)
+
+        result = await handler._generate_video_editing_plan("Edit my wedding video")
+
+    assert result["subtractionTasks"][0]["tags"] == ["timing"]
+
+
+async def test_generate_plan_falls_back_on_invalid_json() -> None:
+    handler = VideoEditingHandler()
+
+    with patch('agent.handlers.video_editing.get_chat_model') as mock_get_llm:
+        mock_get_llm.return_value = _mock_llm("not json")
+
+        result = await handler._generate_video_editing_plan("Edit my wedding video")
+
+    assert result["title"] == "Video Editing Project"
+    assert len(result["subtractionTasks"]) == 3
+    assert len(result["additionTasks"]) == 3
+
+
+def test_fallback_response_uses_language_specific_plan() -> None:
+    handler = VideoEditingHandler()
+
+    zh_data = handler._create_fallback_video_editing_response("zh")["ui_components"][0]["data"]
+    en_data = handler._create_fallback_video_editing_response("ja")["ui_components"][0]["data"]
+
+    assert zh_data["subtractionTasks"][0]["title"] == "移除不需要的片段"
+    assert en_data["subtractionTasks"][0]["title"] == "Remove unwanted footage"
+    assert en_data["additionTasks"][0]["id"] == "add_1"
+
+
+def test_fallback_response_does_not_share_the_constant() -> None:
+    handler = VideoEditingHandler()
+
+    data = handler._create_fallback_video_editing_response("en")["ui_components"][0]["data"]
+    data["subtractionTasks"][0]["tags"].append("mutated")
+
+    fresh = handler._create_fallback_video_editing_response("en")["ui_components"][0]["data"]
+    assert "mutated" not in fresh["subtractionTasks"][0]["tags"]
@@ -0,0 +1,108 @@
+"""Unit tests for the weather handler."""
+from typing import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from agent.handlers import weather
+from agent.handlers.weather import WeatherHandler
+from agent.utils.cities import is_known_city
+from agent.utils.config import Config
+
+
+@pytest.fixture(autouse=True)
+def clear_weather_caches() -> Iterator[None]:
+    weather._weather_cache.clear()
+    weather._rejected_cache.clear()
+    yield
+    weather._weather_cache.clear()
+    weather._rejected_cache.clear()
+
+
+@pytest.mark.parametrize(
+    ("condition", "icon", "language", "description"),
+    [
+        ("Patchy light drizzle", "🌧️", "en", "Rainy weather today"),
+        ("Cloudy with light rain", "🌧️", "en", "Rainy weather today"),
+        ("Partly cloudy", "⛅", "zh", "部分多云"),
+        ("Clear", "☀️", "ja", "晴れて快晴"),
+        ("Heavy snow", "❄️", "en", "Snowy conditions"),
+        ("Mist", "🌤️", "fr", "Pleasant weather"),
+    ],
+)
+def test_format_weather_data_styles(condition: str, icon: str, language: str, description: str) -> None:
+    handler = WeatherHandler()
+    response = {"current": {"temp_f": 60, "condition": {"text": condition}}}
+
+    result = handler._format_weather_data(response, "Paris", language)
+
+    assert result["condition"] == condition
+    assert result["icon"] == icon
+    assert result["description"] == description
+
+
+@pytest.mark.anyio
+async def test_fetch_weather_data_remembers_rejected_cities() -> None:
+    handler = WeatherHandler()
+    request = httpx.Request("GET", "http://api.weatherapi.com/v1/current.json")
+    client = MagicMock()
+    client.get = AsyncMock(return_value=httpx.Response(
+        400, json={"error": {"code": 1006, "message": "No matching location found."}}, request=request
+    ))
+    settings = Config(openai_model_id="gpt-test", openai_api_key=None, weather_api_key="key")
+
+    with patch('agent.handlers.weather.get_http_client', return_value=client), \
+            patch('agent.handlers.weather.get_config', return_value=settings):
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await handler._fetch_weather_data("Atlantis")
+
+    client.get.assert_called_once()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("status_code", [401, 403, 429])
+async def test_fetch_weather_data_retries_transient_client_errors(status_code: int) -> None:
+    handler = WeatherHandler()
+    request = httpx.Request("GET", "http://api.weatherapi.com/v1/current.json")
+    client = MagicMock()
+    client.get = AsyncMock(return_value=httpx.Response(status_code, request=request))
+    settings = Config(openai_model_id="gpt-test", openai_api_key=None, weather_api_key="key")
+
+    with patch('agent.handlers.weather.get_http_client', return_value=client), \
+            patch('agent.handlers.weather.get_config', return_value=settings):
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await handler._fetch_weather_data("Tokyo")
+
+    assert client.get.call_count == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("request_text", ["Tokyo", " San Francisco ", "New York City"])
+async def test_extract_city_skips_llm_for_known_cities(request_text: str) -> None:
+    handler = WeatherHandler()
+
+    with patch('agent.handlers.weather.get_chat_model') as mock_get_llm:
+        city = await handler._extract_city_with_openai(request_text)
+
+    assert city == request_text.strip()
+    mock_get_llm.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Tokyo", True),
+        ("New York City", True),
+        ("Cape Town", True),
+        ("tokyo", True),
+        ("Dinner", False),
+        ("Tomorrow", False),
+        ("Celsius", False),
+        ("My Area", False),
+    ],
+)
+def test_is_known_city(text: str, expected: bool) -> None:
+    assert is_known_city(text) is expected